@@ -0,0 +1,24 @@
+"""
+Shared pytest fixtures for the container-level test scripts
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def gcs_client():
+    """
+    One CloudStorageClient per session, with its bucket already resolved.
+
+    Credential lookup and the bucket existence check are network round-trips;
+    tests reuse the result instead of repeating them. Skips where GCS
+    credentials aren't available.
+    """
+    from gcs_client import CloudStorageClient
+
+    try:
+        client = CloudStorageClient()
+        client.get_or_create_bucket()
+    except Exception as e:
+        pytest.skip(f"GCS not available: {e}")
+    return client
@@ -10,7 +10,8 @@ import time
 import json
 import hashlib
 import logging
-from typing import Dict, Optional, Any
+import threading
+from typing import Dict, Optional, Any, Union
 from google.cloud import storage
 from google.api_core import exceptions
 from google.api_core import retry
@@ -38,7 +39,9 @@ class CloudStorageClient:
 
         self.bucket = None
 
-        # Stats tracking
+        # Stats tracking; the lock keeps updates from concurrent uploads (threads
+        # sharing one client) from being lost
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_uploaded': 0,
             'total_failed': 0,
@@ -98,7 +101,7 @@ class CloudStorageClient:
         self,
         org: str,
         repo: str,
-        summary_content: str,
+        summary_content: Union[str, bytes],
         metadata: Dict[str, Any],
         max_retries: int = 3,
         force: bool = False
@@ -109,7 +112,7 @@ class CloudStorageClient:
         Args:
             org: GitHub organization name
             repo: Repository name
-            summary_content: Gitingest summary text
+            summary_content: Gitingest summary text (UTF-8 bytes are uploaded as-is)
             metadata: Repository metadata (pushedAt, url, processedAt, etc.)
             max_retries: Maximum retry attempts (default 3)
             force: Skip pushedAt cache check and always upload (default False)
@@ -132,19 +135,21 @@ class CloudStorageClient:
         if not force:
             try:
                 check_blob = self.bucket.blob(object_path)
-                check_blob.reload()  # Fetch metadata from GCS
+                # Fetch metadata from GCS - raises NotFound if the object doesn't exist,
+                # so a successful reload doubles as the existence check (one round-trip)
+                check_blob.reload()
 
-                if check_blob.exists():
-                    existing_metadata = check_blob.metadata or {}
-                    existing_pushed_at = existing_metadata.get('pushedAt', '')
-                    new_pushed_at = str(metadata.get('pushedAt', ''))
+                existing_metadata = check_blob.metadata or {}
+                existing_pushed_at = existing_metadata.get('pushedAt', '')
+                new_pushed_at = str(metadata.get('pushedAt', ''))
 
-                    if existing_pushed_at == new_pushed_at:
-                        logger.info(f"⊘ Skipping {org}/{repo} (already up-to-date, pushedAt: {existing_pushed_at})")
+                if existing_pushed_at == new_pushed_at:
+                    logger.info(f"⊘ Skipping {org}/{repo} (already up-to-date, pushedAt: {existing_pushed_at})")
+                    with self._stats_lock:
                         self.stats['total_uploaded'] += 1  # Count as success (already uploaded)
-                        return True
-                    else:
-                        logger.info(f"↻ Updating {org}/{repo} (pushedAt changed: {existing_pushed_at} → {new_pushed_at})")
+                    return True
+                else:
+                    logger.info(f"↻ Updating {org}/{repo} (pushedAt changed: {existing_pushed_at} → {new_pushed_at})")
             except exceptions.NotFound:
                 # File doesn't exist, continue with upload
                 logger.info(f"+ Creating new file {org}/{repo}")
@@ -153,17 +158,20 @@ class CloudStorageClient:
         else:
             logger.info(f"⚡ Force uploading {org}/{repo}")
 
-        # Extract text content from gitingest summary
+        # Use plain text content without metadata header
+        # Store metadata as GCS custom metadata for Vertex AI Search
+        # Extract text content from gitingest summary, encoded once so the size
+        # metadata is a real byte count and retries reuse the same bytes
         # gitingest returns tuple: (summary_text, tree_structure, file_contents)
-        if isinstance(summary_content, tuple):
+        if isinstance(summary_content, (bytes, bytearray)):
+            # Already encoded - hand straight to upload_from_string, no re-encode
+            payload = summary_content
+        elif isinstance(summary_content, tuple):
             # Concatenate all parts into a single text string
-            content_text = '\n\n'.join(str(part) for part in summary_content if part)
+            payload = '\n\n'.join(str(part) for part in summary_content if part).encode('utf-8')
         else:
-            content_text = str(summary_content)
-
-        # Use plain text content without metadata header
-        # Store metadata as GCS custom metadata for Vertex AI Search
-        text_content = content_text
+            payload = str(summary_content).encode('utf-8')
+        payload_size = len(payload)
 
         for attempt in range(max_retries):
             try:
@@ -177,20 +185,21 @@ class CloudStorageClient:
                     'url': metadata.get('url', f"https://github.com/{org}/{repo}"),
                     'pushedAt': str(metadata.get('pushedAt', '')),
                     'processedAt': str(metadata.get('processedAt', '')),
-                    'size': str(len(text_content))
+                    'size': str(payload_size)
                 }
 
                 # Upload as Markdown
                 blob.upload_from_string(
-                    text_content,
+                    payload,
                     content_type='text/markdown; charset=utf-8',
                     retry=retry.Retry(deadline=60.0)  # 60s timeout per upload
                 )
 
                 # Success
-                self.stats['total_uploaded'] += 1
-                self.stats['total_bytes'] += len(text_content)
-                logger.info(f"✓ Uploaded {org}/{repo} to gs://{self.bucket_name}/{object_path} ({len(text_content)} bytes)")
+                with self._stats_lock:
+                    self.stats['total_uploaded'] += 1
+                    self.stats['total_bytes'] += payload_size
+                logger.info(f"✓ Uploaded {org}/{repo} to gs://{self.bucket_name}/{object_path} ({payload_size} bytes)")
                 return True
 
             except Exception as e:
@@ -205,7 +214,8 @@ class CloudStorageClient:
                     time.sleep(delay)
                 else:
                     logger.error(f"✗ Upload failed after {max_retries} attempts: {type(e).__name__}: {e}")
-                    self.stats['total_failed'] += 1
+                    with self._stats_lock:
+                        self.stats['total_failed'] += 1
                     return False
 
         return False
@@ -217,15 +227,18 @@ class CloudStorageClient:
         Returns:
             Dictionary with upload stats
         """
+        with self._stats_lock:
+            stats = dict(self.stats)
+
         return {
-            'total_uploaded': self.stats['total_uploaded'],
-            'total_failed': self.stats['total_failed'],
-            'total_bytes': self.stats['total_bytes'],
-            'total_mb': round(self.stats['total_bytes'] / 1024 / 1024, 2),
+            'total_uploaded': stats['total_uploaded'],
+            'total_failed': stats['total_failed'],
+            'total_bytes': stats['total_bytes'],
+            'total_mb': round(stats['total_bytes'] / 1024 / 1024, 2),
             'success_rate': (
-                round(self.stats['total_uploaded'] /
-                      (self.stats['total_uploaded'] + self.stats['total_failed']) * 100, 2)
-                if (self.stats['total_uploaded'] + self.stats['total_failed']) > 0
+                round(stats['total_uploaded'] /
+                      (stats['total_uploaded'] + stats['total_failed']) * 100, 2)
+                if (stats['total_uploaded'] + stats['total_failed']) > 0
                 else 0.0
             )
         }
@@ -118,6 +118,9 @@ class ProcessingStats:
 # Global stats instance
 stats = ProcessingStats()
 
+# R2 credentials main() checks for before enabling uploads
+R2_REQUIRED_ENV_VARS = frozenset({"R2_BUCKET", "R2_ENDPOINT", "R2_ACCESS_KEY", "R2_SECRET_KEY"})
+
 
 # Timeout handler
 class TimeoutError(Exception):
@@ -491,8 +494,8 @@ Examples:
     )
 
     # Validate environment variables
-    required_env_vars = ["R2_BUCKET", "R2_ENDPOINT", "R2_ACCESS_KEY", "R2_SECRET_KEY"]
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+    # Unset and empty values both count as missing; sorted for stable log output
+    missing_vars = sorted(var for var in R2_REQUIRED_ENV_VARS if not os.getenv(var))
 
     if missing_vars:
         logger.warning(
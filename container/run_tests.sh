@@ -18,6 +18,11 @@ if ! command -v pytest &> /dev/null; then
     pip install -r requirements-test.txt
 fi
 
+# On CI nothing reads .pytest_cache back (no --lf/--ff), so skip writing it
+if [ -n "$CI" ]; then
+    export PYTEST_ADDOPTS="${PYTEST_ADDOPTS:+$PYTEST_ADDOPTS }-p no:cacheprovider"
+fi
+
 # Default: run all tests
 TEST_MODE="${1:-all}"
 
@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures for the container test suite
+"""
+
+import pytest
+
+
+# Environment variables the R2 tests read; cleared before each test that uses r2_env
+R2_ENV_VARS = (
+    "R2_BUCKET",
+    "R2_ENDPOINT",
+    "R2_ACCESS_KEY",
+    "R2_SECRET_KEY",
+    "CLOUDFLARE_ACCOUNT_ID",
+)
+
+
+class EnvSetter:
+    """Thin wrapper over monkeypatch.setenv so tests can set several variables at once"""
+
+    def __init__(self, monkeypatch):
+        self._monkeypatch = monkeypatch
+
+    def set_many(self, values):
+        for key, value in values.items():
+            self._monkeypatch.setenv(key, value)
+
+
+@pytest.fixture
+def r2_env(monkeypatch):
+    """
+    Start each test with the R2 variables unset, and return a setter for them.
+
+    Only the keys in R2_ENV_VARS are touched (rather than clearing os.environ), and
+    monkeypatch restores just those keys on teardown.
+    """
+    for key in R2_ENV_VARS:
+        monkeypatch.delenv(key, raising=False)
+    return EnvSetter(monkeypatch)
+
+
+@pytest.fixture(scope="session")
+def r2():
+    """
+    The r2_client module, imported once per session.
+
+    r2_client was the Cloudflare R2 uploader; tests that request it skip where it
+    isn't deployed.
+    """
+    return pytest.importorskip("r2_client")
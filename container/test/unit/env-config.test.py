@@ -14,11 +14,75 @@ Test coverage:
 - Error handling for missing credentials
 """
 
+import functools
 import pytest
 import os
+import re
+import types
+from pathlib import Path
 from unittest.mock import patch, Mock
 from io import StringIO
 
+# Bound once at import; still reads the live os.environ, so monkeypatch changes are visible
+_getenv = os.getenv
+
+# KEY=value line of a .env file, surrounding whitespace trimmed, values taken literally
+_ENV_LINE_RE = re.compile(r'(?m)^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$')
+
+# Repository root .env.example (container/test/unit/ -> repo root)
+ENV_EXAMPLE_PATH = Path(__file__).resolve().parents[3] / ".env.example"
+
+
+# Docker .env substitution forms: simple, default, required, short
+_DOCKER_ENV_SYNTAXES = frozenset({
+    "${VARIABLE}",
+    "${VARIABLE:-default_value}",
+    "${VARIABLE:?must be set}",
+    "$VARIABLE"
+})
+
+
+def _assert_no_dollar_ref(*values):
+    """Fail, naming the offenders, if any value still contains unexpanded ${...} syntax"""
+    assert not any("${" in value for value in values), \
+        f"unexpanded: {[value for value in values if '${' in value]}"
+
+
+# Complete, valid R2 configuration shared by the validation and client tests (read-only)
+_R2_TEST_CREDS = types.MappingProxyType({
+    "R2_BUCKET": "test-bucket",
+    "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
+    "R2_ACCESS_KEY": "test_access_key",
+    "R2_SECRET_KEY": "test_secret_key"
+})
+
+# Credential sets for test_r2_credentials_read_verbatim
+CRED_BASIC = {
+    "R2_BUCKET": "govreposcrape-gitingest",
+    "R2_ENDPOINT": "https://abc123.r2.cloudflarestorage.com",
+    "R2_ACCESS_KEY": "test_access_key_12345",
+    "R2_SECRET_KEY": "test_secret_key_67890"
+}
+# Special characters are preserved exactly - Python performs no URL encoding
+CRED_SPECIALCHARS = {
+    "R2_BUCKET": "test-bucket",
+    "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
+    "R2_ACCESS_KEY": "test+key/with=special@chars",
+    "R2_SECRET_KEY": "test_secret!@#$%^&*()_+-=[]{}|;:',.<>?/"
+}
+# What Python sees after Docker/docker-compose has expanded ${CLOUDFLARE_ACCOUNT_ID}
+CRED_DOCKER_EXPANDED = {
+    "CLOUDFLARE_ACCOUNT_ID": "abc123def456",
+    "R2_ENDPOINT": "https://abc123def456.r2.cloudflarestorage.com",
+    "R2_ACCESS_KEY": "actual_access_key_value",
+    "R2_SECRET_KEY": "actual_secret_key_value",
+    "R2_BUCKET": "govreposcrape-gitingest"
+}
+# Without Docker, os.getenv() returns ${VARIABLE} syntax literally
+CRED_LITERAL_DOLLAR = {
+    "R2_ENDPOINT": "https://${ACCOUNT_ID}.r2.cloudflarestorage.com"
+}
+
 
 class TestEnvFileParsingWithoutSubstitution:
     """
@@ -32,7 +96,7 @@ class TestEnvFileParsingWithoutSubstitution:
     the .env file is loaded via docker-compose or similar tools.
     """
 
-    def test_env_var_literal_dollar_syntax_preserved(self):
+    def test_env_var_literal_dollar_syntax_preserved(self, r2_env):
         """
         Test: ${VARIABLE} syntax is preserved as literal string
 
@@ -52,94 +116,50 @@ R2_SECRET_KEY=${R2_SECRET_KEY_FROM_SECRET}
 """
 
         # Act - Parse like Python would (no variable expansion)
-        with patch.dict(os.environ, {}, clear=True):
-            # Simulate reading .env file without expansion
-            for line in env_content.strip().split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
-
-            # Assert - Variables are NOT expanded in Python
-            assert os.environ.get('R2_ENDPOINT') == "https://${CLOUDFLARE_ACCOUNT_ID}.r2.cloudflarestorage.com"
-            assert os.environ.get('R2_ACCESS_KEY') == "${R2_ACCESS_KEY_FROM_SECRET}"
-            assert os.environ.get('R2_SECRET_KEY') == "${R2_SECRET_KEY_FROM_SECRET}"
-
-            # This is EXPECTED behavior - Python does not expand variables
-            # Docker will expand these when loading .env file
-
-    def test_env_var_expanded_by_docker(self):
-        """
-        Test: Document that Docker performs variable expansion, not Python
+        # Comment and blank lines don't match the KEY=value pattern
+        r2_env.set_many({match.group(1): match.group(2) for match in _ENV_LINE_RE.finditer(env_content)})
 
-        When Docker loads .env file with:
-            R2_ENDPOINT=https://${CLOUDFLARE_ACCOUNT_ID}.r2.cloudflarestorage.com
-            CLOUDFLARE_ACCOUNT_ID=abc123
+        # Assert - Variables are NOT expanded in Python
+        assert os.environ.get('R2_ENDPOINT') == "https://${CLOUDFLARE_ACCOUNT_ID}.r2.cloudflarestorage.com"
+        assert os.environ.get('R2_ACCESS_KEY') == "${R2_ACCESS_KEY_FROM_SECRET}"
+        assert os.environ.get('R2_SECRET_KEY') == "${R2_SECRET_KEY_FROM_SECRET}"
 
-        Python application will see:
-            os.getenv('R2_ENDPOINT') == "https://abc123.r2.cloudflarestorage.com"
-
-        This test documents the expected Docker behavior.
-        """
-        # Arrange - Simulate what Docker provides after expansion
-        with patch.dict(os.environ, {
-            "CLOUDFLARE_ACCOUNT_ID": "abc123def456",
-            "R2_ENDPOINT": "https://abc123def456.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "actual_access_key_value",
-            "R2_SECRET_KEY": "actual_secret_key_value",
-            "R2_BUCKET": "govreposcrape-gitingest"
-        }, clear=True):
-
-            # Act - Read environment variables (as Python application does)
-            endpoint = os.getenv('R2_ENDPOINT')
-            access_key = os.getenv('R2_ACCESS_KEY')
-            secret_key = os.getenv('R2_SECRET_KEY')
-            bucket = os.getenv('R2_BUCKET')
-
-            # Assert - Variables are fully expanded by Docker
-            assert endpoint == "https://abc123def456.r2.cloudflarestorage.com"
-            assert access_key == "actual_access_key_value"
-            assert secret_key == "actual_secret_key_value"
-            assert bucket == "govreposcrape-gitingest"
-
-            # No ${...} syntax present - Docker already expanded
-            assert "${" not in endpoint
-            assert "${" not in access_key
+        # This is EXPECTED behavior - Python does not expand variables
+        # Docker will expand these when loading .env file
 
 
 class TestR2CredentialsReading:
     """Test reading R2 credentials from environment variables"""
 
-    def test_r2_credentials_read_correctly(self):
+    @pytest.mark.parametrize("creds,literal_dollar", [
+        (CRED_BASIC, False),
+        (CRED_SPECIALCHARS, False),
+        (CRED_DOCKER_EXPANDED, False),
+        (CRED_LITERAL_DOLLAR, True),
+    ], ids=["basic", "special_chars", "docker_expanded", "literal_dollar"])
+    def test_r2_credentials_read_verbatim(self, r2_env, creds, literal_dollar):
         """
-        Test: R2 credentials are read from environment variables
+        Test: R2 credentials are read from environment variables exactly as set
 
         Acceptance Criteria:
-        - All required R2 environment variables are accessible
-        - Values match what was set in environment
+        - All R2 environment variables that were set are accessible
+        - Values match what was set, including special characters
+        - ${VARIABLE} syntax is neither expanded nor removed by Python;
+          Docker performs expansion before Python reads the environment
         """
         # Arrange
-        expected_credentials = {
-            "R2_BUCKET": "govreposcrape-gitingest",
-            "R2_ENDPOINT": "https://abc123.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "test_access_key_12345",
-            "R2_SECRET_KEY": "test_secret_key_67890"
-        }
-
-        with patch.dict(os.environ, expected_credentials, clear=True):
-            # Act
-            bucket = os.getenv('R2_BUCKET')
-            endpoint = os.getenv('R2_ENDPOINT')
-            access_key = os.getenv('R2_ACCESS_KEY')
-            secret_key = os.getenv('R2_SECRET_KEY')
-
-            # Assert
-            assert bucket == expected_credentials["R2_BUCKET"]
-            assert endpoint == expected_credentials["R2_ENDPOINT"]
-            assert access_key == expected_credentials["R2_ACCESS_KEY"]
-            assert secret_key == expected_credentials["R2_SECRET_KEY"]
-
-    def test_r2_credentials_validation(self):
+        r2_env.set_many(creds)
+
+        # Act & Assert
+        for key, value in creds.items():
+            assert _getenv(key) == value
+
+        if literal_dollar:
+            assert any("${" in value for value in creds.values())
+        else:
+            _assert_no_dollar_ref(*creds.values())
+
+    def test_r2_credentials_validation(self, r2, r2_env):
         """
         Test: R2 credential validation detects missing variables
 
@@ -148,23 +168,17 @@ class TestR2CredentialsReading:
         - R2ConfigError is raised with helpful message
         """
         # Arrange - Missing R2_SECRET_KEY
-        with patch.dict(os.environ, {
-            "R2_BUCKET": "test-bucket",
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "test-key"
-            # R2_SECRET_KEY is missing
-        }, clear=True):
+        r2_env.set_many({k: v for k, v in _R2_TEST_CREDS.items() if k != "R2_SECRET_KEY"})
 
-            from r2_client import validate_environment, R2ConfigError
+        # Act & Assert
+        with pytest.raises(r2.R2ConfigError) as exc_info:
+            r2.validate_environment()
 
-            # Act & Assert
-            with pytest.raises(R2ConfigError) as exc_info:
-                validate_environment()
+        error_message = str(exc_info.value)
+        assert "R2_SECRET_KEY" in error_message
+        assert "Missing required R2 environment variables" in error_message
 
-            assert "R2_SECRET_KEY" in str(exc_info.value)
-            assert "Missing required R2 environment variables" in str(exc_info.value)
-
-    def test_all_r2_credentials_present(self):
+    def test_all_r2_credentials_present(self, r2, r2_env):
         """
         Test: Validation passes when all R2 credentials are present
 
@@ -173,42 +187,10 @@ class TestR2CredentialsReading:
         - validate_environment() completes successfully
         """
         # Arrange - All required variables present
-        with patch.dict(os.environ, {
-            "R2_BUCKET": "test-bucket",
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "test-key",
-            "R2_SECRET_KEY": "test-secret"
-        }, clear=True):
-
-            from r2_client import validate_environment
-
-            # Act & Assert - Should not raise exception
-            validate_environment()  # Success if no exception
-
-    def test_r2_credentials_with_special_characters(self):
-        """
-        Test: R2 credentials with special characters are handled correctly
-
-        Acceptance Criteria:
-        - Special characters in keys/secrets are preserved
-        - URL encoding is not performed by Python
-        - Values are read exactly as set
-        """
-        # Arrange - Credentials with special characters
-        with patch.dict(os.environ, {
-            "R2_BUCKET": "test-bucket",
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "test+key/with=special@chars",
-            "R2_SECRET_KEY": "test_secret!@#$%^&*()_+-=[]{}|;:',.<>?/"
-        }, clear=True):
-
-            # Act
-            access_key = os.getenv('R2_ACCESS_KEY')
-            secret_key = os.getenv('R2_SECRET_KEY')
+        r2_env.set_many(_R2_TEST_CREDS)
 
-            # Assert - Special characters preserved exactly
-            assert access_key == "test+key/with=special@chars"
-            assert secret_key == "test_secret!@#$%^&*()_+-=[]{}|;:',.<>?/"
+        # Act & Assert - Should not raise exception
+        r2.validate_environment()  # Success if no exception
 
 
 class TestDockerEnvVariableSubstitution:
@@ -218,6 +200,7 @@ class TestDockerEnvVariableSubstitution:
     These tests document how Docker handles .env files vs how Python reads them.
     """
 
+    @pytest.mark.skip(reason="documentation-only; see docstring")
     def test_docker_env_file_syntax_documentation(self):
         """
         Document: Docker .env file syntax for variable substitution
@@ -232,94 +215,42 @@ class TestDockerEnvVariableSubstitution:
         Docker performs expansion when loading .env file into container.
         """
         # This test is for documentation purposes
-        docker_env_syntaxes = {
-            "simple": "${VARIABLE}",
-            "default": "${VARIABLE:-default_value}",
-            "required": "${VARIABLE:?must be set}",
-            "short": "$VARIABLE"
-        }
-
         # Assert - These are valid Docker .env syntaxes
-        assert all(syntax.startswith("$") for syntax in docker_env_syntaxes.values())
-
-    def test_python_does_not_expand_variables(self):
-        """
-        Test: Python os.getenv() returns literal strings, no expansion
-
-        Acceptance Criteria:
-        - ${VARIABLE} syntax is returned literally
-        - Python does not interpret $ as special character
-        - This is expected behavior
-        """
-        # Arrange - Simulate reading .env with Docker syntax
-        with patch.dict(os.environ, {
-            "R2_ENDPOINT": "https://${ACCOUNT_ID}.r2.cloudflarestorage.com"
-        }, clear=True):
-
-            # Act
-            endpoint = os.getenv('R2_ENDPOINT')
-
-            # Assert - Python returns literal string
-            assert endpoint == "https://${ACCOUNT_ID}.r2.cloudflarestorage.com"
-            assert "${ACCOUNT_ID}" in endpoint  # Literal, not expanded
-
-    def test_docker_compose_expands_before_python(self):
-        """
-        Test: Document the order of operations with Docker
-
-        Order of operations:
-        1. Docker reads .env file
-        2. Docker expands ${VARIABLES} using environment
-        3. Docker sets expanded values in container environment
-        4. Python reads fully-expanded values from os.environ
-
-        Python NEVER sees ${VARIABLE} syntax if Docker does its job correctly.
-        """
-        # Arrange - Simulate POST-Docker expansion (what Python sees)
-        with patch.dict(os.environ, {
-            # These are what Docker provides AFTER expansion
-            "CLOUDFLARE_ACCOUNT_ID": "abc123",
-            "R2_ENDPOINT": "https://abc123.r2.cloudflarestorage.com",  # Already expanded
-            "R2_ACCESS_KEY": "expanded_access_key",  # Already expanded
-        }, clear=True):
-
-            # Act
-            endpoint = os.getenv('R2_ENDPOINT')
-            access_key = os.getenv('R2_ACCESS_KEY')
-
-            # Assert - Python sees expanded values
-            assert "${" not in endpoint, "Docker already expanded variables"
-            assert "${" not in access_key, "Docker already expanded variables"
-            assert endpoint == "https://abc123.r2.cloudflarestorage.com"
+        assert all(syntax.startswith("$") for syntax in _DOCKER_ENV_SYNTAXES)
 
 
 class TestEnvFileParsingEdgeCases:
     """Test edge cases in environment variable handling"""
 
-    def test_empty_environment_variable(self):
-        """
-        Test: Empty environment variables are handled
+    @pytest.mark.parametrize("env,expected", [
+        # Empty string is a valid value, distinct from an undefined variable (None)
+        ({"R2_BUCKET": "", "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com"},
+         {"R2_BUCKET": "", "R2_ACCESS_KEY": None}),
+        # Most .env parsers strip outer quotes before the value reaches os.environ
+        ({"R2_BUCKET": "govreposcrape-gitingest", "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com"},
+         {"R2_BUCKET": "govreposcrape-gitingest"}),
+        # .env parsers trim spaces around values; spaces within values are preserved
+        ({"R2_BUCKET": "govreposcrape-gitingest", "R2_CUSTOM": "value with spaces"},
+         {"R2_BUCKET": "govreposcrape-gitingest", "R2_CUSTOM": "value with spaces"}),
+    ], ids=["empty_value", "quotes_stripped", "spaces_trimmed"])
+    def test_env_var_edge_cases(self, r2_env, env, expected):
+        """
+        Test: Edge-case values are read back exactly as the .env parser left them
 
         Acceptance Criteria:
-        - Empty string is valid value
-        - Different from undefined variable
+        - Empty string is valid and different from an undefined variable
+        - No surrounding quotes or spaces reach the application
+        - Spaces within values are preserved
         """
         # Arrange
-        with patch.dict(os.environ, {
-            "R2_BUCKET": "",  # Empty but defined
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com"
-        }, clear=True):
-
-            # Act
-            bucket = os.getenv('R2_BUCKET')
-            missing = os.getenv('R2_ACCESS_KEY')
+        r2_env.set_many(env)
 
-            # Assert
-            assert bucket == "", "Empty string is valid"
-            assert bucket is not None, "Empty string is defined"
-            assert missing is None, "Undefined variable returns None"
+        # Act & Assert
+        for key, value in expected.items():
+            assert _getenv(key) == value
 
-    def test_multiline_environment_variables(self):
+    @pytest.mark.skip(reason="documentation-only; see docstring")
+    def test_multiline_environment_variables(self, r2_env):
         """
         Test: Environment variables with newlines
 
@@ -327,70 +258,34 @@ class TestEnvFileParsingEdgeCases:
         This documents the limitation.
         """
         # Arrange - Single line value (standard .env behavior)
-        with patch.dict(os.environ, {
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com"
-        }, clear=True):
-
-            # Act
-            endpoint = os.getenv('R2_ENDPOINT')
-
-            # Assert - Should be single line
-            assert '\n' not in endpoint, ".env files don't support multiline well"
-
-    def test_env_var_with_quotes(self):
-        """
-        Test: Environment variables with quotes in .env files
-
-        .env parsers may or may not strip quotes.
-        This documents expected behavior.
-        """
-        # Arrange - With quotes (some .env parsers strip them)
-        with patch.dict(os.environ, {
-            # Most .env parsers strip outer quotes
-            "R2_BUCKET": "govreposcrape-gitingest",  # Quotes stripped
+        r2_env.set_many({
             "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com"
-        }, clear=True):
+        })
 
-            # Act
-            bucket = os.getenv('R2_BUCKET')
+        # Act
+        endpoint = _getenv('R2_ENDPOINT')
 
-            # Assert - Quotes should be stripped by .env parser
-            assert bucket == "govreposcrape-gitingest"
-            assert not bucket.startswith('"')
-            assert not bucket.endswith('"')
+        # Assert - Should be single line
+        assert '\n' not in endpoint, ".env files don't support multiline well"
 
-    def test_env_var_with_spaces(self):
-        """
-        Test: Environment variables with leading/trailing spaces
 
-        Acceptance Criteria:
-        - .env parsers should trim spaces around values
-        - Spaces within values are preserved
-        """
-        # Arrange
-        with patch.dict(os.environ, {
-            # Spaces around value should be trimmed by .env parser
-            "R2_BUCKET": "govreposcrape-gitingest",
-            # Spaces within value are preserved
-            "R2_CUSTOM": "value with spaces"
-        }, clear=True):
+@pytest.fixture(scope="class")
+def _class_boto_client():
+    with patch('boto3.client') as mock_client:
+        yield mock_client
 
-            # Act
-            bucket = os.getenv('R2_BUCKET')
-            custom = os.getenv('R2_CUSTOM')
 
-            # Assert
-            assert bucket == "govreposcrape-gitingest"
-            assert not bucket.startswith(' ')
-            assert not bucket.endswith(' ')
-            assert custom == "value with spaces"  # Internal spaces preserved
+@pytest.fixture
+def mock_boto_client(_class_boto_client):
+    """Class-shared boto3.client patch, reset before each test"""
+    _class_boto_client.reset_mock()
+    return _class_boto_client
 
 
 class TestR2ClientWithEnvVars:
     """Test R2 client creation with environment variables"""
 
-    @patch('boto3.client')
-    def test_r2_client_uses_env_vars(self, mock_boto_client):
+    def test_r2_client_uses_env_vars(self, r2, mock_boto_client, r2_env):
         """
         Test: R2 client is created using environment variables
 
@@ -399,27 +294,20 @@ class TestR2ClientWithEnvVars:
         - Endpoint, access key, secret key are passed correctly
         """
         # Arrange
-        with patch.dict(os.environ, {
-            "R2_BUCKET": "test-bucket",
-            "R2_ENDPOINT": "https://test.r2.cloudflarestorage.com",
-            "R2_ACCESS_KEY": "test_access_key",
-            "R2_SECRET_KEY": "test_secret_key"
-        }, clear=True):
-
-            from r2_client import create_r2_client
-
-            # Act
-            create_r2_client()
-
-            # Assert - boto3.client called with env var values
-            mock_boto_client.assert_called_once_with(
-                "s3",
-                endpoint_url="https://test.r2.cloudflarestorage.com",
-                aws_access_key_id="test_access_key",
-                aws_secret_access_key="test_secret_key"
-            )
-
-    def test_r2_client_fails_without_env_vars(self):
+        r2_env.set_many(_R2_TEST_CREDS)
+
+        # Act
+        r2.create_r2_client()
+
+        # Assert - boto3.client called with env var values
+        mock_boto_client.assert_called_once_with(
+            "s3",
+            endpoint_url=_R2_TEST_CREDS["R2_ENDPOINT"],
+            aws_access_key_id=_R2_TEST_CREDS["R2_ACCESS_KEY"],
+            aws_secret_access_key=_R2_TEST_CREDS["R2_SECRET_KEY"]
+        )
+
+    def test_r2_client_fails_without_env_vars(self, r2, r2_env):
         """
         Test: R2 client creation fails without required environment variables
 
@@ -427,22 +315,31 @@ class TestR2ClientWithEnvVars:
         - R2ConfigError is raised
         - Error message lists missing variables
         """
-        # Arrange - Empty environment
-        with patch.dict(os.environ, {}, clear=True):
+        # Arrange - Empty environment (r2_env unsets all R2 variables)
+
+        # Act & Assert
+        with pytest.raises(r2.R2ConfigError) as exc_info:
+            r2.create_r2_client()
+
+        error_message = str(exc_info.value)
+        assert "Missing required R2 environment variables" in error_message
+        # Should list all missing variables
+        assert "R2_BUCKET" in error_message
+        assert "R2_ENDPOINT" in error_message
+        assert "R2_ACCESS_KEY" in error_message
+        assert "R2_SECRET_KEY" in error_message
+
 
-            from r2_client import create_r2_client, R2ConfigError
+@functools.lru_cache(maxsize=1)
+def _read_env_example() -> str:
+    """Read the repository's .env.example once per session"""
+    return ENV_EXAMPLE_PATH.read_text(encoding="utf-8")
 
-            # Act & Assert
-            with pytest.raises(R2ConfigError) as exc_info:
-                create_r2_client()
 
-            error_message = str(exc_info.value)
-            assert "Missing required R2 environment variables" in error_message
-            # Should list all missing variables
-            assert "R2_BUCKET" in error_message
-            assert "R2_ENDPOINT" in error_message
-            assert "R2_ACCESS_KEY" in error_message
-            assert "R2_SECRET_KEY" in error_message
+def _parse_env_example() -> dict:
+    if not ENV_EXAMPLE_PATH.exists():
+        pytest.skip(".env.example not present (container-only checkout)")
+    return {m.group(1): m.group(2) for m in _ENV_LINE_RE.finditer(_read_env_example())}
 
 
 class TestEnvExampleFile:
@@ -453,49 +350,41 @@ class TestEnvExampleFile:
         Test: .env.example file documents all required variables
 
         Acceptance Criteria:
-        - All R2 required variables are documented
+        - Variables read by the container (gcs_client) are documented
         - Example values are provided
-        - Variables use Docker substitution syntax where appropriate
         """
-        # Read .env.example file
-        env_example_path = "/Users/cns/httpdocs/cddo/govreposcrape/.env.example"
-
-        # This test assumes .env.example exists and contains required variables
-        # We document what should be in the file
+        # Arrange
+        env_vars = _parse_env_example()
 
+        # Since the GCP migration the container reads GCS settings, not R2 credentials
         required_vars = [
-            "R2_BUCKET",
-            "R2_ENDPOINT",
-            "R2_ACCESS_KEY",
-            "R2_SECRET_KEY"
+            "GCS_BUCKET_NAME",
+            "GOOGLE_APPLICATION_CREDENTIALS",
+            "GOOGLE_PROJECT_ID"
         ]
 
-        # Document: .env.example should contain these variables
-        assert len(required_vars) == 4, "Four R2 variables required"
+        # Assert
+        for var in required_vars:
+            assert var in env_vars, f"{var} missing from .env.example"
+            assert env_vars[var], f"{var} has no example value"
+        assert not any(var.startswith("R2_") for var in env_vars), \
+            "R2 variables were removed in the GCP migration"
 
     def test_env_example_uses_placeholder_values(self):
         """
-        Document: .env.example should use placeholder values
+        Test: .env.example uses placeholder values for account-specific settings
 
         Example:
-        R2_BUCKET=govreposcrape-gitingest
-        R2_ENDPOINT=https://[your-account-id].r2.cloudflarestorage.com
-        R2_ACCESS_KEY=your_r2_access_key_here
-        R2_SECRET_KEY=your_r2_secret_key_here
+        GOOGLE_PROJECT_ID=your_project_id_here
+        GCS_BUCKET_NAME=govreposcrape-summaries
         """
-        # This test documents expected format
-        expected_format = {
-            "R2_BUCKET": "govreposcrape-gitingest",  # Actual value
-            "R2_ENDPOINT": "https://[your-account-id].r2.cloudflarestorage.com",  # Placeholder
-            "R2_ACCESS_KEY": "your_r2_access_key_here",  # Placeholder
-            "R2_SECRET_KEY": "your_r2_secret_key_here"  # Placeholder
-        }
-
-        # Assert - Placeholders are clear
-        assert "[your-account-id]" in expected_format["R2_ENDPOINT"]
-        assert "your_" in expected_format["R2_ACCESS_KEY"]
-        assert "_here" in expected_format["R2_SECRET_KEY"]
+        # Arrange
+        env_vars = _parse_env_example()
 
+        # Assert - Placeholders are clear, shared defaults are real values
+        assert env_vars["GOOGLE_PROJECT_ID"].startswith("your_")
+        assert env_vars["GOOGLE_PROJECT_ID"].endswith("_here")
+        assert env_vars["GCS_BUCKET_NAME"] == "govreposcrape-summaries"
 
 # TODO: Add tests for .env file loading with python-dotenv library
 # TODO: Add tests for environment variable precedence (shell > .env)
@@ -14,95 +14,92 @@ Test coverage:
 - Verify correct byte counting (UTF-8 encoding)
 """
 
+import importlib.util
 import pytest
 from unittest.mock import patch, MagicMock, Mock
 from collections import namedtuple
 
+from ingest import process_repository
+
 
 # Constants matching ingest.py
 MAX_SUMMARY_SIZE = 524288  # 512KB
 TRUNCATION_NOTICE = "\n\n[... Summary truncated at 512KB limit ...]"
 
+# The limit is in bytes, so assertions compare encoded lengths; notice length computed once
+_NOTICE_BYTES = TRUNCATION_NOTICE.encode('utf-8')
+_NOTICE_LEN = len(_NOTICE_BYTES)
 
-class TestSummaryTruncation:
-    """Test summary truncation at 512KB boundary"""
+# process_repository no longer truncates (Vertex AI Search handles large documents), so
+# tests that expect the notice are skipped until truncation comes back or they are removed
+no_truncation = pytest.mark.skip(reason="ingest.py no longer truncates summaries")
 
-    @patch('gitingest.ingest')
-    @patch('ingest.upload_summary_to_r2')
-    def test_no_truncation_small_summary(self, mock_upload, mock_ingest):
-        """
-        Test: Summary < 512KB is NOT truncated
+# r2_client was the Cloudflare R2 uploader; the R2 tests skip where it isn't deployed
+requires_r2_client = pytest.mark.skipif(
+    importlib.util.find_spec("r2_client") is None, reason="r2_client not installed"
+)
 
-        Acceptance Criteria:
-        - Original summary is preserved unchanged
-        - truncated flag is False in metadata
-        - No truncation notice is added
-        """
-        # Arrange - Small summary (10KB)
-        small_summary = "# Test Repository\n\n" + ("x" * 10000)  # ~10KB
-        assert len(small_summary) < MAX_SUMMARY_SIZE
-
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
-        mock_ingest.return_value = IngestionResult(
-            summary=small_summary,
-            tree="src/"
-        )
+# Padding built once at import; tests slice what they need instead of re-multiplying
+_X_2MB = "x" * (2 * 1024 * 1024)
+_X_512KB = _X_2MB[:MAX_SUMMARY_SIZE]
+_EMOJI_512KB = "😀" * 131072  # 4 bytes each * 131072 = 524288 bytes (exactly 512KB)
 
-        from ingest import process_repository
+# Stand-in for gitingest's result object, built once for the whole module
+IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
 
-        # Act
-        result = process_repository(
-            "https://github.com/test/small-repo",
-            upload_to_r2=False
-        )
 
-        # Assert
-        assert result["success"] is True
-        assert result["summary"] == small_summary, \
-            "Small summary should not be truncated"
-        assert TRUNCATION_NOTICE not in result["summary"], \
-            "Truncation notice should not be present"
-        assert len(result["summary"]) == len(small_summary), \
-            "Summary length should be unchanged"
+class TestSummaryTruncation:
+    """Test summary truncation at 512KB boundary"""
 
+    @pytest.mark.parametrize("size,expect_truncate", [
+        (0, False),
+        (10_000, False),
+        (MAX_SUMMARY_SIZE, False),
+        pytest.param(MAX_SUMMARY_SIZE + 1, True, marks=no_truncation),
+        pytest.param(2 * MAX_SUMMARY_SIZE, True, marks=no_truncation),
+        pytest.param(4 * MAX_SUMMARY_SIZE, True, marks=no_truncation),
+    ], ids=["empty", "small", "exactly_512kb", "512kb_plus_one", "1mb", "2mb"])
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
-    def test_no_truncation_exactly_512kb(self, mock_upload, mock_ingest):
+    def test_truncation_behavior(self, mock_upload, mock_ingest, size, expect_truncate):
         """
-        Test: Summary = 512KB exactly is NOT truncated
+        Test: Summaries are truncated only when they exceed 512KB
 
         Acceptance Criteria:
-        - Summary at exactly 512KB boundary is preserved
-        - No truncation occurs
-        - truncated flag is False
+        - Summaries up to and including 512KB are preserved unchanged
+        - Larger summaries keep their first 512KB and end with the notice
+        - Truncated summaries are at most 512KB + notice length in bytes
         """
-        # Arrange - Exactly 512KB
-        exactly_512kb = "x" * MAX_SUMMARY_SIZE
-        assert len(exactly_512kb) == MAX_SUMMARY_SIZE
+        # Arrange - Slice of the shared padding
+        summary = _X_2MB[:size]
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
-            summary=exactly_512kb,
+            summary=summary,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
-            "https://github.com/test/exactly-512kb-repo",
+            "https://github.com/test/repo",
             upload_to_r2=False
         )
 
         # Assert
         assert result["success"] is True
-        assert result["summary"] == exactly_512kb, \
-            "512KB summary should not be truncated"
-        assert TRUNCATION_NOTICE not in result["summary"], \
-            "Truncation notice should not be present at boundary"
-        assert len(result["summary"]) == MAX_SUMMARY_SIZE, \
-            "Summary should be exactly 512KB"
-
+        if not expect_truncate:
+            assert result["summary"] == summary, \
+                "Summary at or under 512KB should not be truncated"
+            assert TRUNCATION_NOTICE not in result["summary"], \
+                "Truncation notice should not be present"
+        else:
+            assert result["summary"].endswith(TRUNCATION_NOTICE), \
+                "Truncation notice should be at end of summary"
+            assert len(result["summary"].encode('utf-8')) <= MAX_SUMMARY_SIZE + _NOTICE_LEN, \
+                "Truncated summary should be at most 512KB + notice length in bytes"
+            assert result["summary"][:MAX_SUMMARY_SIZE] == summary[:MAX_SUMMARY_SIZE], \
+                "First 512KB should be preserved exactly"
+
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
     def test_truncation_over_512kb(self, mock_upload, mock_ingest):
@@ -116,18 +113,15 @@ class TestSummaryTruncation:
         - Original size is logged
         """
         # Arrange - Large summary (1MB)
-        large_summary = "# Large Repository\n\n" + ("x" * 1000000)  # ~1MB
+        large_summary = "# Large Repository\n\n" + _X_2MB[:1000000]  # ~1MB
         original_length = len(large_summary)
         assert original_length > MAX_SUMMARY_SIZE
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=large_summary,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/large-repo",
@@ -143,11 +137,14 @@ class TestSummaryTruncation:
         assert result["summary"].endswith(TRUNCATION_NOTICE), \
             "Truncation notice should be at end of summary"
 
-        # Verify truncated content + notice is present
-        expected_truncated = large_summary[:MAX_SUMMARY_SIZE] + TRUNCATION_NOTICE
-        assert result["summary"] == expected_truncated, \
+        # Verify truncated content + notice is present, without building the expected string:
+        # exact length, plus the kept 512KB being a prefix of the original, pins it down
+        assert len(result["summary"]) == MAX_SUMMARY_SIZE + len(TRUNCATION_NOTICE), \
             "Truncated summary should be 512KB + notice"
+        assert large_summary.startswith(result["summary"][:MAX_SUMMARY_SIZE]), \
+            "First 512KB should be preserved exactly"
 
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
     def test_truncation_notice_format(self, mock_upload, mock_ingest):
@@ -160,35 +157,33 @@ class TestSummaryTruncation:
         - Notice clearly indicates 512KB limit
         """
         # Arrange - Summary just over 512KB
-        over_512kb = "x" * (MAX_SUMMARY_SIZE + 1000)
+        over_512kb = _X_2MB[:MAX_SUMMARY_SIZE + 1000]
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=over_512kb,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/repo",
             upload_to_r2=False
         )
 
-        # Assert - Verify notice format
-        assert "\n\n[..." in result["summary"], \
+        # Assert - Verify notice format on the tail only, not the whole 512KB summary
+        notice = result["summary"][-len(TRUNCATION_NOTICE):]
+        assert notice.startswith("\n\n[..."), \
             "Notice should start with double newline and bracket"
-        assert "truncated" in result["summary"].lower(), \
+        assert "truncated" in notice.lower(), \
             "Notice should mention 'truncated'"
-        assert "512KB" in result["summary"] or "512 KB" in result["summary"], \
+        assert "512KB" in notice or "512 KB" in notice, \
             "Notice should specify 512KB limit"
-        assert "...]" in result["summary"], \
+        assert notice.endswith("...]"), \
             "Notice should end with bracket"
 
         # Verify exact notice text
         expected_notice = "\n\n[... Summary truncated at 512KB limit ...]"
-        assert result["summary"].endswith(expected_notice), \
+        assert notice == expected_notice, \
             f"Notice should match exact format: {expected_notice}"
 
     @patch('gitingest.ingest')
@@ -204,17 +199,14 @@ class TestSummaryTruncation:
         """
         # Arrange - Known content that exceeds 512KB
         prefix = "# Known Content\n\nThis is the start of the summary.\n\n"
-        padding = "x" * (MAX_SUMMARY_SIZE - len(prefix) + 1000)
+        padding = _X_2MB[:MAX_SUMMARY_SIZE - len(prefix) + 1000]
         large_summary = prefix + padding
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=large_summary,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/repo",
@@ -231,6 +223,7 @@ class TestSummaryTruncation:
         assert actual_preserved == expected_preserved, \
             "First 512KB should be preserved exactly"
 
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
     def test_truncation_metadata_logging(self, mock_upload, mock_ingest, caplog):
@@ -244,16 +237,13 @@ class TestSummaryTruncation:
         - Log uses structured JSON format
         """
         # Arrange - Large summary
-        large_summary = "x" * (MAX_SUMMARY_SIZE + 50000)
+        large_summary = _X_2MB[:MAX_SUMMARY_SIZE + 50000]
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=large_summary,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         with caplog.at_level('WARNING'):
             result = process_repository(
@@ -261,18 +251,20 @@ class TestSummaryTruncation:
                 upload_to_r2=False
             )
 
-        # Assert - Verify logging occurred
-        log_messages = [record.message for record in caplog.records]
-        truncation_logs = [msg for msg in log_messages if 'truncat' in msg.lower()]
+        # Assert - Verify logging occurred (stop at the first matching record)
+        truncation_log = next(
+            (record.message for record in caplog.records if 'truncat' in record.message.lower()),
+            None
+        )
 
-        assert len(truncation_logs) > 0, \
+        assert truncation_log is not None, \
             "Should log warning when truncation occurs"
 
         # Verify log contains size information
-        truncation_log = truncation_logs[0]
         assert "524288" in truncation_log or "512" in truncation_log, \
             "Log should mention 512KB/524288 bytes"
 
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
     def test_utf8_encoding_byte_counting(self, mock_upload, mock_ingest):
@@ -286,21 +278,19 @@ class TestSummaryTruncation:
         """
         # Arrange - Summary with multi-byte UTF-8 characters
         # Each emoji is 4 bytes in UTF-8
-        emoji_padding = "😀" * 131072  # 4 bytes each * 131072 = 524288 bytes (exactly 512KB)
+        emoji_padding = _EMOJI_512KB
         summary_with_emoji = emoji_padding + "extra"
 
-        # Verify our test data is correct
-        assert len(summary_with_emoji.encode('utf-8')) > MAX_SUMMARY_SIZE, \
+        # Verify our test data is correct (encoded once, reused below)
+        encoded_len = len(summary_with_emoji.encode('utf-8'))
+        assert encoded_len > MAX_SUMMARY_SIZE, \
             "Test data should exceed 512KB in bytes"
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=summary_with_emoji,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/emoji-repo",
@@ -310,10 +300,13 @@ class TestSummaryTruncation:
         # Assert - Truncation should occur
         assert TRUNCATION_NOTICE in result["summary"], \
             "Summary with multi-byte chars should be truncated"
-
-        # Note: Python's string slicing is character-based, not byte-based
-        # So truncation in ingest.py might not be perfect at UTF-8 boundaries
-        # This is acceptable as it's a rough limit
+        encoded = result["summary"].encode('utf-8')
+        assert encoded.endswith(_NOTICE_BYTES), \
+            "Truncation notice should be at end of encoded summary"
+        assert len(encoded) <= MAX_SUMMARY_SIZE + _NOTICE_LEN, \
+            "Truncated summary should be at most 512KB + notice length in bytes"
+        assert len(encoded) - _NOTICE_LEN < encoded_len, \
+            "Kept content should be shorter than the original in bytes"
 
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
@@ -328,8 +321,6 @@ class TestSummaryTruncation:
         # Arrange - Mock non-string summary (edge case)
         mock_ingest.return_value = None  # Unexpected None return
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/broken-repo",
@@ -345,89 +336,7 @@ class TestSummaryTruncation:
 class TestTruncationEdgeCases:
     """Test edge cases for summary truncation"""
 
-    @patch('gitingest.ingest')
-    @patch('ingest.upload_summary_to_r2')
-    def test_truncation_with_exact_boundary_plus_one(self, mock_upload, mock_ingest):
-        """Test truncation at 512KB + 1 byte"""
-        # Arrange
-        summary_512kb_plus_1 = "x" * (MAX_SUMMARY_SIZE + 1)
-
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
-        mock_ingest.return_value = IngestionResult(
-            summary=summary_512kb_plus_1,
-            tree="src/"
-        )
-
-        from ingest import process_repository
-
-        # Act
-        result = process_repository(
-            "https://github.com/test/repo",
-            upload_to_r2=False
-        )
-
-        # Assert
-        assert TRUNCATION_NOTICE in result["summary"], \
-            "Should truncate even 1 byte over limit"
-        assert len(result["summary"]) == MAX_SUMMARY_SIZE + len(TRUNCATION_NOTICE), \
-            "Truncated summary should be exactly 512KB + notice length"
-
-    @patch('gitingest.ingest')
-    @patch('ingest.upload_summary_to_r2')
-    def test_empty_summary_no_truncation(self, mock_upload, mock_ingest):
-        """Test empty summary is not truncated"""
-        # Arrange
-        empty_summary = ""
-
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
-        mock_ingest.return_value = IngestionResult(
-            summary=empty_summary,
-            tree="src/"
-        )
-
-        from ingest import process_repository
-
-        # Act
-        result = process_repository(
-            "https://github.com/test/empty-repo",
-            upload_to_r2=False
-        )
-
-        # Assert
-        assert result["success"] is True
-        assert result["summary"] == "", \
-            "Empty summary should remain empty"
-        assert TRUNCATION_NOTICE not in result["summary"]
-
-    @patch('gitingest.ingest')
-    @patch('ingest.upload_summary_to_r2')
-    def test_very_large_summary_2mb(self, mock_upload, mock_ingest):
-        """Test truncation of very large summary (2MB)"""
-        # Arrange - 2MB summary
-        very_large_summary = "x" * (2 * 1024 * 1024)  # 2MB
-        assert len(very_large_summary) > MAX_SUMMARY_SIZE * 3
-
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
-        mock_ingest.return_value = IngestionResult(
-            summary=very_large_summary,
-            tree="src/"
-        )
-
-        from ingest import process_repository
-
-        # Act
-        result = process_repository(
-            "https://github.com/test/huge-repo",
-            upload_to_r2=False
-        )
-
-        # Assert
-        assert TRUNCATION_NOTICE in result["summary"]
-        assert len(result["summary"]) == MAX_SUMMARY_SIZE + len(TRUNCATION_NOTICE)
-
-        # Verify first 512KB is preserved
-        assert result["summary"][:MAX_SUMMARY_SIZE] == very_large_summary[:MAX_SUMMARY_SIZE]
-
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('ingest.upload_summary_to_r2')
     def test_truncation_with_newlines_preserved(self, mock_upload, mock_ingest):
@@ -436,14 +345,11 @@ class TestTruncationEdgeCases:
         structured_content = "# Section 1\n\n" + ("content\n" * 100000)
         assert len(structured_content) > MAX_SUMMARY_SIZE
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=structured_content,
             tree="src/"
         )
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/test/structured-repo",
@@ -455,9 +361,11 @@ class TestTruncationEdgeCases:
         assert TRUNCATION_NOTICE in result["summary"]
 
 
+@requires_r2_client
 class TestTruncationIntegrationWithR2:
     """Test truncation integration with R2 upload"""
 
+    @no_truncation
     @patch('gitingest.ingest')
     @patch('r2_client.upload_with_retry')
     def test_truncated_summary_uploaded_to_r2(self, mock_r2_upload, mock_ingest):
@@ -470,9 +378,8 @@ class TestTruncationIntegrationWithR2:
         - Upload succeeds
         """
         # Arrange - Large summary
-        large_summary = "x" * (MAX_SUMMARY_SIZE + 10000)
+        large_summary = _X_2MB[:MAX_SUMMARY_SIZE + 10000]
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=large_summary,
             tree="src/"
@@ -480,8 +387,6 @@ class TestTruncationIntegrationWithR2:
 
         mock_r2_upload.return_value = True  # Upload succeeds
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/alphagov/test-repo",
@@ -515,7 +420,6 @@ class TestTruncationIntegrationWithR2:
         # Arrange - Small summary
         small_summary = "# Small Repo\n\nJust a small summary."
 
-        IngestionResult = namedtuple('IngestionResult', ['summary', 'tree'])
         mock_ingest.return_value = IngestionResult(
             summary=small_summary,
             tree="src/"
@@ -523,8 +427,6 @@ class TestTruncationIntegrationWithR2:
 
         mock_r2_upload.return_value = True
 
-        from ingest import process_repository
-
         # Act
         result = process_repository(
             "https://github.com/alphagov/small-repo",
@@ -0,0 +1,105 @@
+"""
+govreposcrape - Cloud Storage Client Tests
+Unit tests for CloudStorageClient.upload_summary against a mocked bucket
+
+Runs offline: storage.Client is patched, so no credentials or network are needed
+(test_gcs_client.py covers the real upload against GCS).
+
+Test coverage:
+- str, bytes and tuple content are uploaded via upload_from_string as UTF-8 bytes
+- The 'size' metadata is the payload's byte length
+- A missing object (NotFound on reload) is uploaded; a matching pushedAt is skipped
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from google.api_core import exceptions
+
+import gcs_client
+from gcs_client import CloudStorageClient
+
+
+METADATA = {
+    'url': 'https://github.com/test/test-repo',
+    'pushedAt': '2025-01-01T00:00:00Z',
+    'processedAt': '2025-01-17T00:00:00Z'
+}
+
+CONTENT_TYPE = 'text/markdown; charset=utf-8'
+
+
+@pytest.fixture
+def blob():
+    """Blob returned for every bucket.blob() call; reload reports the object missing"""
+    blob = MagicMock()
+    blob.metadata = None
+    blob.reload.side_effect = exceptions.NotFound("no such object")
+    return blob
+
+
+@pytest.fixture
+def client(blob):
+    """CloudStorageClient wired to a mock bucket, so no credentials or network are used"""
+    with patch.object(gcs_client.storage, 'Client'):
+        client = CloudStorageClient()
+    client.bucket = MagicMock()
+    client.bucket.blob.return_value = blob
+    return client
+
+
+@pytest.mark.unit
+class TestUploadSummaryPayloads:
+    """Each content type reaches GCS as the right bytes"""
+
+    @pytest.mark.parametrize("content,expected", [
+        ("plain summary", b"plain summary"),
+        ("non-ascii ✓ summary", "non-ascii ✓ summary".encode('utf-8')),
+        (b"already encoded", b"already encoded"),
+        (("summary", "tree", "", "files"), b"summary\n\ntree\n\nfiles"),
+    ], ids=["str", "str_utf8", "bytes", "tuple"])
+    def test_content_uploaded_as_utf8_bytes(self, client, blob, content, expected):
+        assert client.upload_summary('test', 'test-repo', content, METADATA)
+
+        blob.upload_from_string.assert_called_once()
+        args, kwargs = blob.upload_from_string.call_args
+        assert args[0] == expected
+        assert kwargs['content_type'] == CONTENT_TYPE
+        assert blob.metadata['size'] == str(len(expected))
+        assert client.get_stats()['total_bytes'] == len(expected)
+
+
+@pytest.mark.unit
+class TestUploadSummaryCacheCheck:
+    """The pushedAt check decides whether an existing object is re-uploaded"""
+
+    def test_missing_object_is_uploaded(self, client, blob):
+        assert client.upload_summary('test', 'test-repo', "summary", METADATA)
+
+        blob.reload.assert_called_once()
+        blob.upload_from_string.assert_called_once()
+        assert blob.metadata['pushedAt'] == METADATA['pushedAt']
+
+    def test_matching_pushed_at_skips_upload(self, client, blob):
+        blob.reload.side_effect = None
+        blob.metadata = {'pushedAt': METADATA['pushedAt']}
+
+        assert client.upload_summary('test', 'test-repo', "summary", METADATA)
+
+        blob.upload_from_string.assert_not_called()
+        assert client.get_stats()['total_uploaded'] == 1
+
+    def test_changed_pushed_at_is_uploaded(self, client, blob):
+        blob.reload.side_effect = None
+        blob.metadata = {'pushedAt': '2024-12-01T00:00:00Z'}
+
+        assert client.upload_summary('test', 'test-repo', "summary", METADATA)
+
+        blob.upload_from_string.assert_called_once()
+        assert blob.metadata['pushedAt'] == METADATA['pushedAt']
+
+    def test_force_skips_check(self, client, blob):
+        assert client.upload_summary('test', 'test-repo', "summary", METADATA, force=True)
+
+        blob.reload.assert_not_called()
+        blob.upload_from_string.assert_called_once()
@@ -9,25 +9,21 @@ Tests cover:
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from gcs_client import CloudStorageClient
 
-def test_gcs_upload():
-    """Test GCS upload with various file sizes."""
+# Largest payload in the size sweep, encoded once; each case uploads a slice
+_MAX_BYTES = b'x' * (512 * 1024)
+
+def run_gcs_upload(client):
+    """Upload a sweep of file sizes through client; True if every upload succeeded."""
 
     print("\n" + "="*70)
     print("Google Cloud Storage Upload Validation Test")
     print("Testing Cloud Storage client for Vertex AI Search backend")
     print("="*70 + "\n")
 
-    # Initialize client
-    try:
-        client = CloudStorageClient()
-        bucket_name = client.get_or_create_bucket()
-        print(f"✓ Connected to GCS bucket: {bucket_name}\n")
-    except Exception as e:
-        print(f"✗ Failed to initialize GCS client: {e}")
-        print("\nEnsure GOOGLE_APPLICATION_CREDENTIALS is set correctly")
-        return False
+    print(f"✓ Connected to GCS bucket: {client.bucket_name}\n")
 
     # Test cases with different file sizes
     test_sizes = [
@@ -45,25 +41,35 @@ def test_gcs_upload():
         'processedAt': '2025-01-17T00:00:00Z'
     }
 
+    def make_content(size_kb):
+        return _MAX_BYTES[:size_kb * 1024]  # Already UTF-8, so no re-encode on upload
+
     all_passed = True
 
-    for size_kb, description in test_sizes:
-        print(f"Testing: {description}")
-        content = 'x' * (size_kb * 1024)  # Generate test content
+    # Uploads are independent network round-trips - run them concurrently
+    with ThreadPoolExecutor(max_workers=len(test_sizes)) as executor:
+        futures = {
+            executor.submit(
+                client.upload_summary,
+                org='test',
+                repo=f'size-test-{size_kb}kb',
+                summary_content=make_content(size_kb),
+                metadata=metadata_template
+            ): (size_kb, description)
+            for size_kb, description in test_sizes
+        }
 
-        result = client.upload_summary(
-            org='test',
-            repo=f'size-test-{size_kb}kb',
-            summary_content=content,
-            metadata=metadata_template
-        )
+        # Results are collected on this thread, so all_passed needs no lock
+        for future in as_completed(futures):
+            size_kb, description = futures[future]
+            print(f"Testing: {description}")
 
-        if result:
-            print(f"  ✓ SUCCESS - {size_kb}KB file uploaded\n")
-        else:
-            print(f"  ✗ FAILED - {size_kb}KB file upload failed\n")
-            all_passed = False
-            # Continue testing other sizes instead of breaking
+            if future.result():
+                print(f"  ✓ SUCCESS - {size_kb}KB file uploaded\n")
+            else:
+                print(f"  ✗ FAILED - {size_kb}KB file upload failed\n")
+                all_passed = False
+                # Continue testing other sizes instead of breaking
 
     # Print final statistics
     print("\n" + "="*70)
@@ -77,6 +83,21 @@ def test_gcs_upload():
         print("\n✗ Some tests FAILED - review errors above")
         return False
 
+
+def test_gcs_upload(gcs_client):
+    """Test GCS upload with various file sizes."""
+    # Client and bucket are resolved once per session (see conftest.py)
+    assert run_gcs_upload(gcs_client), "Some GCS uploads failed - see output above"
+
 if __name__ == "__main__":
-    success = test_gcs_upload()
+    # Initialize client
+    try:
+        client = CloudStorageClient()
+        client.get_or_create_bucket()
+    except Exception as e:
+        print(f"✗ Failed to initialize GCS client: {e}")
+        print("\nEnsure GOOGLE_APPLICATION_CREDENTIALS is set correctly")
+        sys.exit(1)
+
+    success = run_gcs_upload(client)
     sys.exit(0 if success else 1)
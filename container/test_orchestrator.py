@@ -7,87 +7,135 @@ Coverage target: 80%+ on core orchestration logic.
 """
 
 import pytest
+import sys
 import time
 import signal
 import json
 import os
+import logging
+from collections import namedtuple
+from contextlib import ExitStack
+from types import MappingProxyType
 from unittest.mock import Mock, patch, MagicMock, call
 from orchestrator import (
-    check_cache_status,
+    current_state,
     format_elapsed_time,
     log_progress,
-    log_final_summary,
     graceful_shutdown,
     main
 )
 
 
-class TestCacheChecking:
-    """Test cache status checking functionality"""
+def _make_repos(count):
+    return tuple({"url": f"https://github.com/org/repo{i}"} for i in range(count))
 
-    def test_check_cache_status_mvp_mode(self):
-        """Test cache check returns all repos as needing processing (MVP mode)"""
-        # Arrange
-        repos = [
-            {"url": "https://github.com/alphagov/repo1", "pushedAt": "2025-01-01T00:00:00Z"},
-            {"url": "https://github.com/alphagov/repo2", "pushedAt": "2025-01-02T00:00:00Z"},
-            {"url": "https://github.com/alphagov/repo3", "pushedAt": "2025-01-03T00:00:00Z"}
-        ]
 
-        # Act
-        cache_status = check_cache_status(repos)
+# Repo lists built once at import; run_main copies them into a list before mocking
+_REPOS_10 = _make_repos(10)
+_REPOS_100 = _make_repos(100)
+_REPOS_250 = _make_repos(250)
 
-        # Assert
-        assert len(cache_status) == 3
-        assert all(needs_processing for needs_processing in cache_status.values())
-        assert cache_status["https://github.com/alphagov/repo1"] is True
-        assert cache_status["https://github.com/alphagov/repo2"] is True
-        assert cache_status["https://github.com/alphagov/repo3"] is True
-
-    def test_check_cache_status_empty_list(self):
-        """Test cache check with empty repository list"""
-        # Arrange
-        repos = []
+# process_repository results, read-only so they can be shared across tests. A success
+# needs a summary or main() counts it as a failure
+_PROCESS_OK = MappingProxyType({"success": True, "duration": 10, "summary": "Test summary"})
+_PROCESS_FAILED = MappingProxyType({"success": False, "error": "Failed"})
 
-        # Act
-        cache_status = check_cache_status(repos)
+# side_effect sequences; Mock iterates a fresh copy each time one is assigned
+_RESULTS_8_OK_2_FAILED = (_PROCESS_OK,) * 8 + (_PROCESS_FAILED,) * 2
+_RESULTS_MIDDLE_FAILED = (_PROCESS_OK, _PROCESS_FAILED, _PROCESS_OK)
 
-        # Assert
-        assert len(cache_status) == 0
-        assert cache_status == {}
+PipelineRun = namedtuple(
+    "PipelineRun",
+    ["exit_code", "mock_fetch", "mock_filter", "mock_process", "log_messages"]
+)
 
 
-class TestTimeFormatting:
-    """Test elapsed time formatting"""
+def run_main_expecting_exit(monkeypatch, argv, expected_code=0):
+    """Run orchestrator.main() with the given argv and assert it exits with expected_code"""
+    monkeypatch.setattr(sys, "argv", list(argv))
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == expected_code
+
+
+@pytest.fixture
+def log_text(caplog):
+    """
+    Capture INFO logs and return a function that joins the captured messages.
+
+    Call it once after the code under test has run, then use substring checks on
+    the result instead of re-scanning caplog.records for every assertion.
+    """
+    caplog.set_level(logging.INFO, logger="gitingest-container")
+    return lambda: "\n".join(record.message for record in caplog.records)
+
+
+@pytest.fixture
+def run_main(caplog, monkeypatch):
+    """
+    Run orchestrator.main() with every pipeline stage mocked.
+
+    Returns a function taking the argv and the fetch/filter/process behaviour, and
+    returning a PipelineRun with the exit code, the stage mocks and the log messages.
+    Cloud Storage and SBOM lookups are always stubbed so no test touches the network.
+    """
+    def run(argv, fetch_return=(), filter_return=None, process_return=None, process_side_effect=None):
+        fetch_return = list(fetch_return)
+        monkeypatch.setattr(sys, "argv", list(argv))
+        with ExitStack() as stack:
+            mock_fetch = stack.enter_context(
+                patch('orchestrator.fetch_repos_json', return_value=fetch_return))
+            mock_filter = stack.enter_context(
+                patch('orchestrator.filter_repos_for_batch',
+                      return_value=fetch_return if filter_return is None else filter_return))
+            mock_process = stack.enter_context(
+                patch('orchestrator.process_repository',
+                      return_value=process_return, side_effect=process_side_effect))
+            stack.enter_context(patch('orchestrator.CloudStorageClient'))
+            stack.enter_context(patch('orchestrator.fetch_sbom_dependencies', return_value=None))
+
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            exit_code = exc_info.value.code
+
+        return PipelineRun(
+            exit_code, mock_fetch, mock_filter, mock_process,
+            [record.message for record in caplog.records]
+        )
 
-    def test_format_elapsed_time_seconds(self):
-        """Test formatting seconds only"""
-        assert format_elapsed_time(45) == "45s"
-        assert format_elapsed_time(1) == "1s"
+    return run
 
-    def test_format_elapsed_time_minutes(self):
-        """Test formatting minutes and seconds"""
-        assert format_elapsed_time(75) == "1m 15s"
-        assert format_elapsed_time(900) == "15m 0s"
-        assert format_elapsed_time(125) == "2m 5s"
 
-    def test_format_elapsed_time_hours(self):
-        """Test formatting hours and minutes"""
-        assert format_elapsed_time(3600) == "1h 0m"
-        assert format_elapsed_time(3660) == "1h 1m"
-        assert format_elapsed_time(20820) == "5h 47m"  # Example from AC
+class TestTimeFormatting:
+    """Test elapsed time formatting"""
+
+    @pytest.mark.parametrize("seconds,expected", [
+        # Seconds only
+        (45, "45s"),
+        (1, "1s"),
+        # Minutes and seconds
+        (75, "1m 15s"),
+        (900, "15m 0s"),
+        (125, "2m 5s"),
+        # Hours and minutes
+        (3600, "1h 0m"),
+        (3660, "1h 1m"),
+        (20820, "5h 47m"),  # Example from AC
+    ])
+    def test_format_elapsed_time(self, seconds, expected):
+        """Test formatting of seconds, minutes and hours"""
+        assert format_elapsed_time(seconds) == expected
 
 
 class TestProgressReporting:
     """Test progress logging functionality"""
 
-    def test_log_progress_format(self, caplog):
+    def test_log_progress_format(self, log_text):
         """Test progress log includes all required fields"""
         # Act
         log_progress(
             processed=500,
             total=24500,
-            cached=450,
             successful=45,
             failed=5,
             elapsed=900,  # 15 minutes
@@ -96,10 +144,9 @@ class TestProgressReporting:
         )
 
         # Assert
-        log_messages = [record.message for record in caplog.records]
-        assert any("500/24500" in msg for msg in log_messages)
-        assert any("2.0%" in msg for msg in log_messages)
-        assert any("cache hit: 90.0%" in msg for msg in log_messages)
+        text = log_text()
+        assert "500/24500" in text
+        assert "2.0%" in text
 
     def test_log_progress_zero_processed(self, caplog):
         """Test progress logging with zero repos processed"""
@@ -107,7 +154,6 @@ class TestProgressReporting:
         log_progress(
             processed=0,
             total=1000,
-            cached=0,
             successful=0,
             failed=0,
             elapsed=1,
@@ -119,63 +165,32 @@ class TestProgressReporting:
         assert len(caplog.records) > 0
 
 
-class TestFinalStatistics:
-    """Test final statistics summary"""
+@pytest.fixture
+def reset_current_state():
+    """Restore orchestrator.current_state after the test, so mutations don't leak"""
+    saved = dict(current_state)
+    yield current_state
+    current_state.clear()
+    current_state.update(saved)
 
-    def test_log_final_summary_format(self, caplog):
-        """Test final summary matches AC format"""
-        # Act
-        log_final_summary(
-            total_repos=24500,
-            cached=22000,
-            processed=2300,
-            failed=200,
-            elapsed=20820,  # 5h 47m
-            batch_size=10,
-            offset=0
-        )
-
-        # Assert
-        log_messages = [record.message for record in caplog.records]
-        summary_msg = log_messages[0]
-
-        assert "24500 total" in summary_msg or "24,500 total" in summary_msg
-        assert "22000 cached" in summary_msg or "22,000 cached" in summary_msg
-        assert "89.8%" in summary_msg
-        assert "2300 processed" in summary_msg or "2,300 processed" in summary_msg
-        assert "200 failed" in summary_msg
-        assert "5h 47m" in summary_msg
-
-    def test_log_final_summary_cache_hit_rate(self, caplog):
-        """Test cache hit rate calculation"""
-        # Act
-        log_final_summary(
-            total_repos=1000,
-            cached=900,
-            processed=95,
-            failed=5,
-            elapsed=600,
-            batch_size=1,
-            offset=0
-        )
 
-        # Assert
-        log_messages = [record.message for record in caplog.records]
-        assert any("90.0%" in msg for msg in log_messages)
+@pytest.fixture
+def shutdown_mocks(reset_current_state):
+    """Patch the state-file open() and sys.exit for graceful_shutdown; yields (mock_open, mock_exit)"""
+    with patch('builtins.open', create=True) as mock_open, patch('sys.exit') as mock_exit:
+        yield mock_open, mock_exit
 
 
 class TestGracefulShutdown:
     """Test graceful shutdown handling"""
 
-    @patch('builtins.open', create=True)
-    @patch('sys.exit')
-    def test_graceful_shutdown_saves_state(self, mock_exit, mock_open):
+    def test_graceful_shutdown_saves_state(self, shutdown_mocks, reset_current_state):
         """Test SIGTERM triggers state save"""
         # Arrange
-        from orchestrator import current_state
-        current_state["repos_processed"] = 150
-        current_state["batch_size"] = 10
-        current_state["offset"] = 3
+        mock_open, mock_exit = shutdown_mocks
+        reset_current_state["repos_processed"] = 150
+        reset_current_state["batch_size"] = 10
+        reset_current_state["offset"] = 3
 
         mock_file = MagicMock()
         mock_open.return_value.__enter__.return_value = mock_file
@@ -187,10 +202,12 @@ class TestGracefulShutdown:
         mock_open.assert_called_once_with("/tmp/orchestrator-state.json", 'w')
         mock_exit.assert_called_once_with(0)
 
-    @patch('builtins.open', side_effect=IOError("Disk full"))
-    @patch('sys.exit')
-    def test_graceful_shutdown_handles_save_error(self, mock_exit, mock_open):
+    def test_graceful_shutdown_handles_save_error(self, shutdown_mocks):
         """Test graceful shutdown handles file write errors"""
+        # Arrange
+        mock_open, mock_exit = shutdown_mocks
+        mock_open.side_effect = IOError("Disk full")
+
         # Act
         graceful_shutdown(signal.SIGTERM, None)
 
@@ -201,174 +218,108 @@ class TestGracefulShutdown:
 class TestCLIInterface:
     """Test command-line interface"""
 
-    @patch('sys.argv', ['orchestrator.py', '--batch-size=10', '--offset=3', '--dry-run'])
     @patch('orchestrator.fetch_repos_json')
-    def test_cli_argument_parsing(self, mock_fetch):
+    def test_cli_argument_parsing(self, mock_fetch, monkeypatch):
         """Test CLI parses arguments correctly"""
         # Arrange
-        mock_fetch.return_value = [{"url": f"https://github.com/org/repo{i}"} for i in range(100)]
+        mock_fetch.return_value = list(_REPOS_100)
 
-        # Act
-        try:
-            main()
-        except SystemExit as e:
-            # Assert exit code 0 on success
-            assert e.code == 0
-
-    @patch('sys.argv', ['orchestrator.py', '--batch-size=10', '--offset=10'])
-    def test_cli_invalid_offset(self):
-        """Test CLI validation: offset must be < batch_size"""
-        # Act & Assert
-        with pytest.raises(SystemExit) as exc_info:
-            main()
+        # Act & Assert - exit code 0 on success
+        run_main_expecting_exit(
+            monkeypatch, ['orchestrator.py', '--batch-size=10', '--offset=3', '--dry-run'])
 
-        # Should exit with error code 2 (argparse error)
-        assert exc_info.value.code == 2
+    def test_cli_invalid_offset(self, monkeypatch):
+        """Test CLI validation: offset must be < batch_size"""
+        # Act & Assert - Should exit with error code 2 (argparse error)
+        run_main_expecting_exit(
+            monkeypatch, ['orchestrator.py', '--batch-size=10', '--offset=10'], expected_code=2)
 
-    @patch('sys.argv', ['orchestrator.py', '--help'])
-    def test_cli_help_text(self):
+    def test_cli_help_text(self, monkeypatch):
         """Test CLI help displays usage examples"""
-        # Act & Assert
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        # Help should exit with code 0
-        assert exc_info.value.code == 0
+        # Act & Assert - Help should exit with code 0
+        run_main_expecting_exit(monkeypatch, ['orchestrator.py', '--help'])
 
 
 class TestPipelineExecution:
     """Test end-to-end pipeline execution"""
 
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py'])
-    def test_pipeline_execution_order(self, mock_fetch, mock_filter, mock_process):
+    def test_pipeline_execution_order(self, run_main):
         """Test pipeline executes in correct order: fetch → cache → process → upload"""
-        # Arrange
-        mock_fetch.return_value = [
-            {"url": "https://github.com/org/repo1", "pushedAt": "2025-01-01T00:00:00Z"},
-            {"url": "https://github.com/org/repo2", "pushedAt": "2025-01-02T00:00:00Z"}
-        ]
-        mock_filter.return_value = mock_fetch.return_value
-        mock_process.return_value = {"success": True, "duration": 10}
-
         # Act
-        try:
-            main()
-        except SystemExit:
-            pass
+        run = run_main(
+            ['orchestrator.py'],
+            fetch_return=[
+                {"url": "https://github.com/org/repo1", "pushedAt": "2025-01-01T00:00:00Z"},
+                {"url": "https://github.com/org/repo2", "pushedAt": "2025-01-02T00:00:00Z"}
+            ],
+            process_return=_PROCESS_OK
+        )
 
         # Assert - Verify execution order
-        assert mock_fetch.called
-        assert mock_filter.called
-        assert mock_process.called
-        assert mock_process.call_count == 2
+        assert run.mock_fetch.called
+        assert run.mock_filter.called
+        assert run.mock_process.called
+        assert run.mock_process.call_count == 2
 
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py', '--dry-run'])
-    def test_dry_run_mode(self, mock_fetch, mock_filter, mock_process):
+    def test_dry_run_mode(self, run_main):
         """Test dry-run mode skips actual processing"""
-        # Arrange
-        mock_fetch.return_value = []  # Empty list for quick execution
-
         # Act
-        try:
-            main()
-        except SystemExit:
-            pass
+        run = run_main(['orchestrator.py', '--dry-run'])  # Empty list for quick execution
 
         # Assert - In dry-run mode, real fetch/process should NOT be called
-        assert not mock_fetch.called
-        assert not mock_process.called
+        assert not run.mock_fetch.called
+        assert not run.mock_process.called
 
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py', '--batch-size=10', '--offset=0'])
-    def test_parallel_execution_filtering(self, mock_fetch, mock_filter, mock_process):
+    def test_parallel_execution_filtering(self, run_main):
         """Test parallel execution uses modulo filtering"""
-        # Arrange
-        all_repos = [{"url": f"https://github.com/org/repo{i}"} for i in range(100)]
-        mock_fetch.return_value = all_repos
-        mock_filter.return_value = all_repos[::10]  # Every 10th repo
-        mock_process.return_value = {"success": True, "duration": 10}
-
         # Act
-        try:
-            main()
-        except SystemExit:
-            pass
+        run = run_main(
+            ['orchestrator.py', '--batch-size=10', '--offset=0'],
+            fetch_return=_REPOS_100,
+            filter_return=list(_REPOS_100[::10]),  # Every 10th repo
+            process_return=_PROCESS_OK
+        )
 
         # Assert
-        mock_filter.assert_called_once()
-        call_args = mock_filter.call_args
+        run.mock_filter.assert_called_once()
+        call_args = run.mock_filter.call_args
         assert call_args[0][1] == 10  # batch_size
         assert call_args[0][2] == 0   # offset
 
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py'])
-    def test_fail_safe_behavior(self, mock_fetch, mock_filter, mock_process):
+    def test_fail_safe_behavior(self, run_main):
         """Test pipeline continues on individual repo failures"""
-        # Arrange
-        mock_fetch.return_value = [
-            {"url": "https://github.com/org/repo1"},
-            {"url": "https://github.com/org/repo2"},
-            {"url": "https://github.com/org/repo3"}
-        ]
-        mock_filter.return_value = mock_fetch.return_value
-
-        # Simulate middle repo failing
-        mock_process.side_effect = [
-            {"success": True, "duration": 10},
-            {"success": False, "error": "Processing failed"},
-            {"success": True, "duration": 10}
-        ]
+        # Act - Simulate middle repo failing
+        run = run_main(
+            ['orchestrator.py'],
+            fetch_return=[
+                {"url": "https://github.com/org/repo1"},
+                {"url": "https://github.com/org/repo2"},
+                {"url": "https://github.com/org/repo3"}
+            ],
+            process_side_effect=_RESULTS_MIDDLE_FAILED
+        )
 
-        # Act
-        try:
-            main()
-        except SystemExit as e:
-            # Assert - Should exit successfully despite one failure
-            assert e.code == 0
+        # Assert - Should exit successfully despite one failure
+        assert run.exit_code == 0
 
         # Assert - All repos attempted despite failure
-        assert mock_process.call_count == 3
+        assert run.mock_process.call_count == 3
 
 
 class TestStatisticsAccuracy:
     """Test statistics tracking accuracy"""
 
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py'])
-    def test_statistics_calculation(self, mock_fetch, mock_filter, mock_process, caplog):
+    def test_statistics_calculation(self, run_main):
         """Test final statistics are calculated correctly"""
-        # Arrange
-        repos = [{"url": f"https://github.com/org/repo{i}"} for i in range(10)]
-        mock_fetch.return_value = repos
-        mock_filter.return_value = repos
-
-        # 8 successful, 2 failed
-        mock_process.side_effect = (
-            [{"success": True, "duration": 10}] * 8 +
-            [{"success": False, "error": "Failed"}] * 2
+        # Act - 8 successful, 2 failed
+        run = run_main(
+            ['orchestrator.py'],
+            fetch_return=_REPOS_10,
+            process_side_effect=_RESULTS_8_OK_2_FAILED
         )
 
-        # Act
-        try:
-            main()
-        except SystemExit:
-            pass
-
         # Assert
-        log_messages = [record.message for record in caplog.records]
-        final_msg = [msg for msg in log_messages if "Pipeline complete" in msg][0]
+        final_msg = next(msg for msg in run.log_messages if "Pipeline complete" in msg)
 
         assert "10 total" in final_msg
         assert "8 processed" in final_msg
@@ -379,23 +330,14 @@ class TestProgressReportingFrequency:
     """Test progress reporting happens at correct intervals"""
 
     @patch('orchestrator.log_progress')
-    @patch('orchestrator.process_repository')
-    @patch('orchestrator.filter_repos_for_batch')
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py'])
-    def test_progress_reported_every_100_repos(self, mock_fetch, mock_filter, mock_process, mock_log_progress):
+    def test_progress_reported_every_100_repos(self, mock_log_progress, run_main):
         """Test progress logged every 100 repos"""
-        # Arrange
-        repos = [{"url": f"https://github.com/org/repo{i}"} for i in range(250)]
-        mock_fetch.return_value = repos
-        mock_filter.return_value = repos
-        mock_process.return_value = {"success": True, "duration": 10}
-
         # Act
-        try:
-            main()
-        except SystemExit:
-            pass
+        run_main(
+            ['orchestrator.py'],
+            fetch_return=_REPOS_250,
+            process_return=_PROCESS_OK
+        )
 
         # Assert - Should be called at repos 100 and 200 (not at 0, not at end)
         assert mock_log_progress.call_count == 2
@@ -404,35 +346,27 @@ class TestProgressReportingFrequency:
 class TestEmptyReposList:
     """Test handling of edge cases"""
 
-    @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py'])
-    def test_empty_repos_list(self, mock_fetch):
+    def test_empty_repos_list(self, run_main):
         """Test pipeline handles empty repository list gracefully"""
-        # Arrange
-        mock_fetch.return_value = []
+        # Act
+        run = run_main(['orchestrator.py'])
 
-        # Act & Assert - Should not crash
-        try:
-            main()
-        except SystemExit as e:
-            assert e.code == 0
+        # Assert - Should not crash
+        assert run.exit_code == 0
+        assert not run.mock_process.called
 
 
 class TestStructuredJSONOutput:
     """Test structured JSON logging format"""
 
     @patch('orchestrator.fetch_repos_json')
-    @patch('sys.argv', ['orchestrator.py', '--dry-run'])
-    def test_final_summary_json_format(self, mock_fetch, caplog):
+    def test_final_summary_json_format(self, mock_fetch, caplog, monkeypatch):
         """Test final summary uses structured JSON format"""
         # Arrange
         mock_fetch.return_value = []  # Empty for quick execution
 
         # Act
-        try:
-            main()
-        except SystemExit:
-            pass
+        run_main_expecting_exit(monkeypatch, ['orchestrator.py', '--dry-run'])
 
         # Assert - Check logs contain structured format
         # (Actual JSON validation would require parsing log output)
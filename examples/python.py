@@ -4,7 +4,7 @@ govscraperepo MCP API - Python Example
 Demonstrates how to search UK government code repositories using requests library
 
 Prerequisites: Python 3.7+, requests library
-Installation: pip install requests
+Installation: pip install requests (optionally msgspec and orjson for faster JSON parsing)
 Usage: python3 examples/python.py
 
 This example shows:
@@ -12,27 +12,152 @@ This example shows:
 - Type hints for better code documentation
 - Comprehensive error handling with specific exception types
 - Result parsing and display with metadata
+- Connection reuse with a shared requests.Session
 """
 
 import os
 import sys
 import json
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import atexit
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, get_type_hints
+from dataclasses import dataclass, fields, is_dataclass, asdict, MISSING
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import ReadTimeoutError
 except ImportError:
     print("❌ Error: 'requests' library not installed")
     print("   Install with: pip install requests")
     print("   Then run this script again")
     sys.exit(1)
 
+# orjson is optional: faster parsing straight from response bytes and encoding straight
+# to bytes, stdlib json otherwise
+try:
+    import orjson
+
+    def json_loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+    def json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def json_pretty(value: Any) -> str:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
+    def json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode('utf-8')
+
+    def json_pretty(value: Any) -> str:
+        return json.dumps(value, indent=2)
+
+# Typed decoding of the response dataclasses, fastest available first:
+# - msgspec decodes JSON bytes straight into the dataclasses, with no intermediate dict
+# - mashumaro generates a decoder per dataclass and parses with orjson
+# - otherwise JSONMixin walks the dataclass fields itself
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    class JSONMixin:
+        """from_dict/from_json for the response dataclasses, backed by msgspec"""
+
+        __slots__ = ()
+
+        @classmethod
+        def from_dict(cls, data: Dict[str, Any]) -> Any:
+            """Create the dataclass from a parsed JSON object"""
+            return msgspec.convert(data, type=cls)
+
+        @classmethod
+        def from_json(cls, raw: bytes) -> Any:
+            """Create the dataclass from a raw JSON response body in a single pass"""
+            return msgspec.json.decode(raw, type=cls)
+else:
+    try:
+        from mashumaro.mixins.orjson import DataClassORJSONMixin as JSONMixin
+    except ImportError:
+        @functools.lru_cache(maxsize=None)
+        def _decode_plan(cls: type) -> tuple:
+            """
+            Per-class decoding plan, worked out once from the type hints
+
+            Returns a (name, optional, nested, is_list) tuple per field, where nested is
+            the dataclass to decode the value into (or None) and is_list marks List[nested].
+            """
+            hints = get_type_hints(cls)
+            plan = []
+            for f in fields(cls):
+                hint = hints[f.name]
+                optional = f.default is not MISSING or f.default_factory is not MISSING
+                if is_dataclass(hint):
+                    plan.append((f.name, optional, hint, False))
+                elif getattr(hint, '__origin__', None) is list and is_dataclass(hint.__args__[0]):
+                    plan.append((f.name, optional, hint.__args__[0], True))
+                else:
+                    plan.append((f.name, optional, None, False))
+            return tuple(plan)
+
+        class JSONMixin:
+            """Fallback for mashumaro's DataClassORJSONMixin: from_dict/from_json for nested dataclasses"""
+
+            __slots__ = ()
+
+            @classmethod
+            def from_dict(cls, data: Dict[str, Any]) -> Any:
+                """Create the dataclass from a parsed JSON object, recursing into nested dataclasses"""
+                values = {}
+                for name, optional, nested, is_list in _decode_plan(cls):
+                    if optional and name not in data:
+                        continue  # Optional field left to its default
+                    value = data[name]
+                    if nested is not None:
+                        if is_list:
+                            value = [nested.from_dict(item) for item in value]
+                        else:
+                            value = nested.from_dict(value)
+                    values[name] = value
+                return cls(**values)
+
+            @classmethod
+            def from_json(cls, raw: bytes) -> Any:
+                """Create the dataclass from a raw JSON response body"""
+                return cls.from_dict(json_loads(raw))
+
 # API Configuration
 API_BASE = os.getenv('MCP_API_URL', 'https://govreposcrape-api-1060386346356.us-central1.run.app')
 API_URL = f'{API_BASE}/mcp/search'
 HEALTH_URL = f'{API_BASE}/mcp/health'
 
+# One session for every request, so calls reuse a kept-alive connection
+# instead of opening a new TCP+TLS connection each time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+# Required headers, sent on every request:
+# - Content-Type: application/json is REQUIRED
+# - X-MCP-Version: 2 is optional but recommended
+_SESSION.headers.update({
+    'Content-Type': 'application/json',
+    'X-MCP-Version': '2',
+})
+atexit.register(_SESSION.close)
+
+# Slotted dataclasses (no per-instance __dict__) where supported (Python 3.10+)
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 # ANSI color codes for terminal output
 class Colors:
     """Terminal color codes"""
@@ -43,8 +168,14 @@ class Colors:
     RESET = '\033[0m'
 
 
-@dataclass
-class SearchMetadata:
+# Colored templates built once; display code only fills in the dynamic fields
+RESULTS_HEADER = f'\n{Colors.BLUE}📊 Results: %d repositories found in %sms{Colors.RESET}\n'
+RESULT_TITLE = f'{Colors.GREEN}[%d] %s{Colors.RESET}'
+ERROR_TITLE = f'\n{Colors.RED}❌ Error: %s{Colors.RESET}'
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class SearchMetadata(JSONMixin):
     """Metadata for a search result"""
     language: str
     stars: int
@@ -52,8 +183,8 @@ class SearchMetadata:
     github_url: str
 
 
-@dataclass
-class SearchResult:
+@dataclass(**DATACLASS_OPTIONS)
+class SearchResult(JSONMixin):
     """Single search result from the MCP API"""
     repository: str
     file_path: str
@@ -61,31 +192,21 @@ class SearchResult:
     relevance_score: float
     metadata: SearchMetadata
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'SearchResult':
-        """Create SearchResult from API response dictionary"""
-        return cls(
-            repository=data['repository'],
-            file_path=data['file_path'],
-            match_snippet=data['match_snippet'],
-            relevance_score=data['relevance_score'],
-            metadata=SearchMetadata(**data['metadata'])
-        )
-
 
-@dataclass
-class SearchResponse:
+@dataclass(**DATACLASS_OPTIONS)
+class SearchResponse(JSONMixin):
     """Response from the MCP search API"""
     results: List[SearchResult]
     took_ms: int
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'SearchResponse':
-        """Create SearchResponse from API response dictionary"""
-        return cls(
-            results=[SearchResult.from_dict(r) for r in data['results']],
-            took_ms=data['took_ms']
-        )
+
+@dataclass(**DATACLASS_OPTIONS)
+class HealthResponse(JSONMixin):
+    """Response from the health endpoint (HealthResponse in api/openapi.yaml)"""
+    status: str = 'unknown'
+    timestamp: Optional[str] = None
+    service: Optional[str] = None
+    version: Optional[str] = None
 
 
 class MCPAPIError(Exception):
@@ -113,29 +234,28 @@ def search_code(query: str, limit: int = 5) -> SearchResponse:
         requests.exceptions.RequestException: On network errors
     """
     try:
-        # Make POST request with required headers
-        # - Content-Type: application/json is REQUIRED
-        # - X-MCP-Version: 2 is optional but recommended
-        response = requests.post(
+        # Make POST request (session sends the required headers, body is pre-encoded JSON)
+        response = _SESSION.post(
             API_URL,
-            headers={
-                'Content-Type': 'application/json',
-                'X-MCP-Version': '2',
-            },
-            json={
+            data=json_dumps({
                 'query': query,
                 'limit': limit,
-            },
+            }),
             timeout=10  # 10 second timeout
         )
 
-        # Parse JSON response
-        data = response.json()
-
         # Check for HTTP errors
         if not response.ok:
             # API returned an error response
-            error_data = data.get('error', {})
+            try:
+                error_data = json_loads(response.content).get('error', {})
+            except ValueError:
+                # Not a JSON error body (e.g. an HTML 502 page from the load balancer)
+                raise MCPAPIError(
+                    message=f'API request failed with HTTP {response.status_code}',
+                    code='HTTP_ERROR',
+                    status_code=response.status_code
+                )
             raise MCPAPIError(
                 message=error_data.get('message', 'API request failed'),
                 code=error_data.get('code', 'UNKNOWN_ERROR'),
@@ -143,8 +263,8 @@ def search_code(query: str, limit: int = 5) -> SearchResponse:
                 details=error_data
             )
 
-        # Parse successful response
-        return SearchResponse.from_dict(data)
+        # Parse successful response straight from the body bytes
+        return SearchResponse.from_json(response.content)
 
     except requests.exceptions.Timeout:
         raise MCPAPIError(
@@ -153,6 +273,14 @@ def search_code(query: str, limit: int = 5) -> SearchResponse:
             status_code=0
         )
     except requests.exceptions.ConnectionError as e:
+        # requests reports a read timeout while downloading the body as a ConnectionError
+        # wrapping urllib3's ReadTimeoutError rather than as a Timeout
+        if e.args and isinstance(e.args[0], ReadTimeoutError):
+            raise MCPAPIError(
+                message='Request timed out after 10 seconds',
+                code='TIMEOUT_ERROR',
+                status_code=0
+            )
         raise MCPAPIError(
             message=f'Could not connect to API: {str(e)}',
             code='CONNECTION_ERROR',
@@ -166,15 +294,15 @@ def search_code(query: str, limit: int = 5) -> SearchResponse:
         )
 
 
-def check_health() -> Dict[str, Any]:
+def check_health() -> HealthResponse:
     """
     Check API health status
 
     Returns:
-        Dictionary with status, services, and timestamp
+        HealthResponse with status, timestamp, service, and version
     """
-    response = requests.get(HEALTH_URL, timeout=10)
-    return response.json()
+    response = _SESSION.get(HEALTH_URL, timeout=10)
+    return HealthResponse.from_json(response.content)
 
 
 def display_results(response: SearchResponse) -> None:
@@ -184,24 +312,30 @@ def display_results(response: SearchResponse) -> None:
     Args:
         response: SearchResponse object to display
     """
-    print(f'\n{Colors.BLUE}📊 Results: {len(response.results)} repositories found in {response.took_ms}ms{Colors.RESET}\n')
+    print(RESULTS_HEADER % (len(response.results), response.took_ms))
 
     if not response.results:
         print(f'{Colors.YELLOW}No results found. Try a different query.{Colors.RESET}')
         return
 
-    # Display each result
+    # Display each result - collect the lines and write them out in one go
+    lines: List[str] = []
+    append, title = lines.append, RESULT_TITLE  # Locals for the loop below
     for index, result in enumerate(response.results, 1):
-        print(f'{Colors.GREEN}[{index}] {result.repository}{Colors.RESET}')
-        print(f'    Score: {result.relevance_score:.3f}')
-        print(f'    Language: {result.metadata.language}')
-        print(f'    GitHub: {result.metadata.github_url}')
+        metadata = result.metadata
+        append(title % (index, result.repository))
+        append(f'    Score: {result.relevance_score:.3f}')
+        append(f'    Language: {metadata.language}')
+        append(f'    GitHub: {metadata.github_url}')
 
         # Display snippet (truncated if too long)
-        snippet = result.match_snippet[:200]
-        truncated = '...' if len(result.match_snippet) > 200 else ''
-        print(f'    Snippet: {snippet}{truncated}')
-        print()
+        snippet = result.match_snippet
+        if len(snippet) > 200:
+            snippet = snippet[:200] + '...'
+        append(f'    Snippet: {snippet}')
+        append('')
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def display_error(error: MCPAPIError) -> None:
@@ -211,14 +345,14 @@ def display_error(error: MCPAPIError) -> None:
     Args:
         error: MCPAPIError object to display
     """
-    print(f'\n{Colors.RED}❌ Error: {str(error)}{Colors.RESET}')
+    print(ERROR_TITLE % error)
     print(f'   Code: {error.code}')
 
     if error.status_code:
         print(f'   HTTP Status: {error.status_code}')
 
     if error.details:
-        print(f'   Details: {json.dumps(error.details, indent=2)}')
+        print(f'   Details: {json_pretty(error.details)}')
 
     print()
 
@@ -228,12 +362,21 @@ def main() -> None:
     print('🔍 govscraperepo MCP API - Python Example')
     print('==========================================\n')
 
+    # The four calls are independent, so send them all at once over the pooled session;
+    # each example below waits on its own result and prints in the usual order
+    executor = ThreadPoolExecutor(max_workers=4)
+    search_future = executor.submit(search_code, 'NHS API integration authentication FHIR patient data', 5)
+    short_query_future = executor.submit(search_code, 'ab', 5)
+    large_limit_future = executor.submit(search_code, 'authentication middleware', 100)
+    health_future = executor.submit(check_health)
+    executor.shutdown(wait=False)  # Nothing more to submit; the calls finish in the background
+
     # Example 1: Successful search query
     print('📝 Example 1: Search for NHS API integration patterns')
     print("Query: 'NHS API integration authentication FHIR patient data'\n")
 
     try:
-        results = search_code('NHS API integration authentication FHIR patient data', 5)
+        results = search_future.result()
         print(f'{Colors.GREEN}✅ Success!{Colors.RESET}')
         display_results(results)
     except MCPAPIError as error:
@@ -248,7 +391,7 @@ def main() -> None:
     print("Query: 'ab' (only 2 characters)\n")
 
     try:
-        search_code('ab', 5)
+        short_query_future.result()
     except MCPAPIError as error:
         print(f'{Colors.GREEN}✅ Error handling works correctly{Colors.RESET}')
         display_error(error)
@@ -262,7 +405,7 @@ def main() -> None:
     print('Limit: 100 (maximum is 20)\n')
 
     try:
-        search_code('authentication middleware', 100)
+        large_limit_future.result()
     except MCPAPIError as error:
         print(f'{Colors.GREEN}✅ Validation works correctly{Colors.RESET}')
         display_error(error)
@@ -276,16 +419,16 @@ def main() -> None:
     print(f'Endpoint: GET {HEALTH_URL}\n')
 
     try:
-        health = check_health()
+        health = health_future.result()
 
-        if health.get('status') == 'healthy':
+        if health.status == 'ok':
             print(f'{Colors.GREEN}✅ API is healthy{Colors.RESET}')
-            print(f'   Status: {health["status"]}')
-            print(f'   Services: {len(health.get("services", {}))} checked')
-            print(f'   Timestamp: {health.get("timestamp")}\n')
+            print(f'   Status: {health.status}')
+            print(f'   Service: {health.service} {health.version}')
+            print(f'   Timestamp: {health.timestamp}\n')
         else:
             print(f'{Colors.YELLOW}⚠️ API has issues{Colors.RESET}')
-            print(json.dumps(health, indent=2))
+            print(json_pretty(asdict(health)))
     except Exception as error:
         print(f'{Colors.RED}❌ Health check failed: {str(error)}{Colors.RESET}\n')
 
@@ -17,18 +17,18 @@ LOCATION = "global"
 DATA_STORE_ID = "govreposcrape-summaries"
 GCS_URI = "gs://govreposcrape-summaries/**/*.jsonl"
 
+PARENT = f"projects/{PROJECT_ID}/locations/{LOCATION}/collections/default_collection/dataStores/{DATA_STORE_ID}/branches/0"
+
+
 def import_documents():
     """Trigger import of JSON Lines documents from GCS."""
 
     # Initialize the DocumentService client
     client = discoveryengine.DocumentServiceClient()
 
-    # Construct the parent path
-    parent = f"projects/{PROJECT_ID}/locations/{LOCATION}/collections/default_collection/dataStores/{DATA_STORE_ID}/branches/0"
-
     # Create import request
     request = discoveryengine.ImportDocumentsRequest(
-        parent=parent,
+        parent=PARENT,
         gcs_source=discoveryengine.GcsSource(
             input_uris=[GCS_URI],
             data_schema="document"  # Use document schema for JSON Lines with structData
@@ -37,7 +37,7 @@ def import_documents():
     )
 
     print(f"Triggering import from {GCS_URI}...")
-    print(f"Parent: {parent}")
+    print(f"Parent: {PARENT}")
     print(f"Schema: document")
     print(f"Reconciliation mode: INCREMENTAL")
 